@@ -3,12 +3,54 @@ import os
 import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 import tomlkit
 
+# Compiled once; detects commits of the type
+# <type>: <description>
+# <type>(<optional scope>): <description>
+# <type>[optional scope]: <description>
+_CONVENTIONAL_COMMIT_RE = re.compile(r"^(\w+)(?:\(|\[)?[^\)\]]*(?:\)|\])?:")
+
+# Matches the first `version = "..."` assignment in a pyproject.toml; in
+# these manifests that is always the [project] version, so the file can be
+# rewritten with a single substitution instead of a full TOML dump
+_PYPROJECT_VERSION_RE = re.compile(rb'^(version\s*=\s*")[^"]+(")', re.MULTILINE)
+
+# Mapping of commit types to version bump
+_TYPE_BUMP_MAP = {
+    "feat": "minor",
+    "fix": "patch",
+    "chore": "patch",
+    "docs": "patch",
+    "refactor": "patch",
+    "test": "patch",
+    "perf": "patch",
+    "style": "patch",
+    "build": "patch",
+    "ci": "patch",
+    "revert": "patch",
+}
+
+
+@dataclass(slots=True)
+class _CommitChange:
+    """A commit in the walked range, classified once at collection time.
+
+    Carrying the bump type on the record itself means a commit touching
+    several packages is never re-classified; slots keep the per-commit
+    footprint small on long histories.
+    """
+
+    subject: str
+    paths: list
+    bump: str
+
 
 class PackageVersionManager:
-    def __init__(self, repo_root, prev_commit, current_commit):
+    def __init__(self, repo_root, prev_commit, current_commit, packages=None):
         """
         Initialize the version manager for a monorepo.
 
@@ -16,6 +58,10 @@ class PackageVersionManager:
             repo_root (str): Root directory of the monorepo
             prev_commit (str): Previous commit hash
             current_commit (str): Current commit hash
+            packages (dict, optional): Pre-discovered package map. Discovery
+                depends only on the tree on disk, so callers constructing
+                several managers over the same tree with different commit
+                ranges can reuse it instead of re-walking the repo.
 
         Raises:
             FileNotFoundError: If the repo_root is invalid or inaccessible.
@@ -26,7 +72,14 @@ class PackageVersionManager:
         self.repo_root = repo_root
         self.prev_commit = prev_commit
         self.current_commit = current_commit
-        self.packages = self._discover_packages()
+        self.packages = packages if packages is not None else self._discover_packages()
+        # Memoized per-package _CommitChange lists; the commit range is fixed
+        # for the lifetime of a manager, so each package's history only needs
+        # to be read once.
+        self._package_changes_cache = {}
+        # Lazily-populated list of _CommitChange records for every commit in
+        # the range, filled by _collect_changes with a single git log.
+        self._range_changes = None
 
     def _validate_pyproject(self, pyproject_data, pyproject_path):
         """
@@ -91,6 +144,14 @@ class PackageVersionManager:
                             "version", "0.0.0"
                         ),
                         "pyproject_data": pyproject_data,
+                        # Extracted once here so the tag helpers don't walk
+                        # the parsed document again on every call
+                        "package_name": pyproject_data["project"].get("name"),
+                        "tag_format": pyproject_data.get("tool", {})
+                        .get("semantic_release", {})
+                        .get("branches", {})
+                        .get("main", {})
+                        .get("tag_format"),
                     }
                 else:
                     raise FileNotFoundError(
@@ -132,14 +193,8 @@ class PackageVersionManager:
             if "breaking change" in message:
                 return "major"
 
-            # Parse commit type
-            """
-            Regex can detect commits of the type
-            <type>: <description>
-            <type>(<optional scope>): <description>
-            <type>[optional scope]: <description>
-            """
-            match = re.match(r"^(\w+)(?:\(|\[)?[^\)\]]*(?:\)|\])?:", message)
+            # Parse commit type with the precompiled regex
+            match = _CONVENTIONAL_COMMIT_RE.match(message)
             if not match:
                 # If the commit message does not match the conventional commit format
                 # and is not empty, treat it as a "chore:" and return "patch".
@@ -149,22 +204,7 @@ class PackageVersionManager:
 
             commit_type = match.group(1)
 
-            # Mapping of commit types to version bump
-            type_bump_map = {
-                "feat": "minor",
-                "fix": "patch",
-                "chore": "patch",
-                "docs": "patch",
-                "refactor": "patch",
-                "test": "patch",
-                "perf": "patch",
-                "style": "patch",
-                "build": "patch",
-                "ci": "patch",
-                "revert": "patch",
-            }
-
-            return type_bump_map.get(commit_type)
+            return _TYPE_BUMP_MAP.get(commit_type)
         except Exception as e:
             print(f"Error parsing commit message: {e}")
             return None
@@ -208,6 +248,150 @@ class PackageVersionManager:
             print(f"Invalid version format: {current_version}")
             raise
 
+    def _collect_changes(self):
+        """
+        List every commit in the range with the paths it touched, once.
+
+        Runs a single `git log --name-only` over the whole commit range and
+        caches the parsed result, so deciding which commits affect which
+        package becomes a pure in-Python scan instead of one `git log` per
+        package.
+
+        Returns:
+            list: _CommitChange records, newest commit first.
+
+        Raises:
+            subprocess.CalledProcessError: If the git command fails.
+        """
+        if self._range_changes is not None:
+            return self._range_changes
+
+        cmd = [
+            "git",
+            "log",
+            "-z",
+            f"{self.prev_commit}^..{self.current_commit}",
+            "--name-only",
+            "--no-renames",
+            "--pretty=format:%x01%s%x02",
+        ]
+
+        # Stream the output and parse records as they arrive instead of
+        # buffering the whole history in one string first; on long ranges
+        # this overlaps parsing with git's own walk and caps memory at one
+        # read chunk plus the records themselves.
+        proc = subprocess.Popen(
+            cmd,
+            cwd=self.repo_root,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+
+        changes = []
+
+        def _parse_record(record):
+            # Machine format: each record is \x01<subject>\x02 followed by
+            # the commit's paths, NUL-terminated thanks to -z, so paths
+            # containing newlines or other special characters parse
+            # unambiguously.
+            subject, _, path_block = record.partition("\x02")
+            paths = [p.strip("\n") for p in path_block.split("\0")]
+            changes.append(
+                _CommitChange(
+                    subject=subject,
+                    paths=[p for p in paths if p],
+                    bump=self._parse_conventional_commit(subject),
+                )
+            )
+
+        buffer = ""
+        for chunk in iter(lambda: proc.stdout.read(65536), ""):
+            buffer += chunk
+            if "\x01" not in buffer:
+                continue
+            records = buffer.split("\x01")
+            # The trailing piece may be a partial record; keep it for the
+            # next chunk
+            buffer = records.pop()
+            for record in records:
+                if record:
+                    _parse_record(record)
+        if buffer:
+            _parse_record(buffer)
+
+        # git log errors are short, so draining stderr after stdout closes
+        # cannot deadlock here
+        stderr = proc.stderr.read()
+        returncode = proc.wait()
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr)
+
+        self._range_changes = changes
+        return changes
+
+    def _package_path_prefixes(self, package_path):
+        """
+        Compute the repo-relative path prefixes belonging to a package.
+
+        Args:
+            package_path (str): Absolute or repo-relative path to the package.
+
+        Returns:
+            list: Prefixes to match changed paths against; "." means the
+                package spans the whole repository.
+        """
+        if os.path.isabs(package_path):
+            rel = os.path.normpath(os.path.relpath(package_path, self.repo_root))
+        else:
+            rel = os.path.normpath(package_path)
+
+        prefixes = [rel]
+
+        # Special handling for feluda package to include root pyproject.toml
+        if package_path == "feluda":
+            prefixes.append("pyproject.toml")
+
+        return prefixes
+
+    @staticmethod
+    def _path_in_prefix(path, prefix):
+        """Check whether a changed path falls under a package prefix."""
+        if prefix == ".":
+            return True
+        return path == prefix or path.startswith(prefix + "/")
+
+    def _get_package_changes(self, package_path):
+        """
+        Get the classified commit records affecting a package.
+
+        Args:
+            package_path (str): Relative path to the package.
+
+        Returns:
+            list: _CommitChange records touching this package, newest first.
+
+        Raises:
+            subprocess.CalledProcessError: If the git command fails.
+        """
+        if package_path in self._package_changes_cache:
+            return self._package_changes_cache[package_path]
+
+        prefixes = self._package_path_prefixes(package_path)
+
+        changes = [
+            change
+            for change in self._collect_changes()
+            if any(
+                self._path_in_prefix(path, prefix)
+                for path in change.paths
+                for prefix in prefixes
+            )
+        ]
+
+        self._package_changes_cache[package_path] = changes
+        return changes
+
     def get_package_commits(self, package_path):
         """
         Get commits specific to a package between two commit ranges.
@@ -227,33 +411,13 @@ class PackageVersionManager:
             Git command fails due to invalid commit range or other issues.
         """
         try:
-            paths_to_check = [package_path]
-
-            # Special handling for feluda package to include root pyproject.toml
-            if package_path == "feluda":
-                paths_to_check.append("pyproject.toml")
-
-            all_commits = []
-            for path in paths_to_check:
-                # Get commits that modified files in this path between two commits
-                cmd = [
-                    "git",
-                    "log",
-                    f"{self.prev_commit}^..{self.current_commit}",
-                    "--pretty=format:%s",
-                    "--",
-                    path,
-                ]
-
-                result = subprocess.run(
-                    cmd, cwd=self.repo_root, capture_output=True, text=True, check=True
-                )
-
-                # Add commits for this path to the total list
-                all_commits.extend(result.stdout.splitlines())
-
             # Remove duplicates while preserving order
-            return list(dict.fromkeys(all_commits))
+            return list(
+                dict.fromkeys(
+                    change.subject
+                    for change in self._get_package_changes(package_path)
+                )
+            )
         except subprocess.CalledProcessError as e:
             print(f"Error getting commits for {package_path}: {e}")
             return []
@@ -274,23 +438,26 @@ class PackageVersionManager:
             No relevant commits or errors occur during commit parsing.
         """
         try:
-            # Get commits for this package
-            package_commits = self.get_package_commits(package_path)
+            # Get the classified commit records for this package
+            package_changes = self._get_package_changes(package_path)
 
             # If no commits, skip this package
-            if not package_commits:
+            if not package_changes:
                 print(f"No changes found for {package_path}. Skipping version bump.")
                 return None
 
             bump_priority = {"major": 3, "minor": 2, "patch": 1, None: 0}
             highest_bump = None
 
-            for commit in package_commits:
-                commit_bump = self._parse_conventional_commit(commit)
-                if commit_bump and bump_priority.get(
-                    commit_bump, 0
+            for change in package_changes:
+                # The bump type was classified once when the range was walked
+                if change.bump and bump_priority.get(
+                    change.bump, 0
                 ) > bump_priority.get(highest_bump, 0):
-                    highest_bump = commit_bump
+                    highest_bump = change.bump
+                # No commit can outrank a major bump, so stop scanning early
+                if highest_bump == "major":
+                    break
 
             return highest_bump
         except Exception as e:
@@ -326,8 +493,9 @@ class PackageVersionManager:
                     f"Version not found in {package_info['pyproject_path']}. Please specify it in the pyproject.toml."
                 )
 
-            # Retrieve tag format
-            tag_format = (
+            # Retrieve tag format, preferring the value cached at discovery
+            # over another walk of the parsed document
+            tag_format = package_info.get("tag_format") or (
                 pyproject_data.get("tool", {})
                 .get("semantic_release", {})
                 .get("branches", {})
@@ -349,6 +517,63 @@ class PackageVersionManager:
             print(f"Unexpected error in _get_tag_format: {e}")
             raise
 
+    def _resolve_tag_name(self, package_info, new_version):
+        """
+        Build the tag name for a package version from its tag format.
+
+        Args:
+            package_info (dict): A dictionary containing package info.
+            new_version (str): The version the tag is for.
+
+        Returns:
+            str: The formatted tag name.
+
+        Raises:
+            ValueError: If the project name or tag format is missing.
+        """
+        # Retrieve project name, preferring the value cached at discovery
+        project_name = package_info.get("package_name") or package_info[
+            "pyproject_data"
+        ].get("project", {}).get("name")
+        if not project_name:
+            raise ValueError(
+                f"Project name not found in {package_info['pyproject_path']}. Please specify it in the pyproject.toml."
+            )
+
+        tag_format = self._get_tag_format(package_info)
+
+        return tag_format.format(name=project_name, version=new_version)
+
+    def _create_tags_batch(self, tag_names):
+        """
+        Create several lightweight tags with a single git invocation.
+
+        Args:
+            tag_names (list): Tag names to create at the current commit.
+
+        Raises:
+            subprocess.CalledProcessError: If the update-ref call fails.
+        """
+        if not tag_names:
+            return
+
+        # update-ref --stdin applies all creations in one transactional
+        # process instead of one `git tag` spawn per package
+        instructions = "".join(
+            f"create refs/tags/{tag_name}\x00{self.current_commit}\x00"
+            for tag_name in tag_names
+        )
+        subprocess.run(
+            ["git", "update-ref", "--stdin", "-z"],
+            cwd=self.repo_root,
+            input=instructions,
+            text=True,
+            check=True,
+        )
+
+        for tag_name in tag_names:
+            print(f"Created tag {tag_name}")
+
     def tag_exists(self, package_info, new_version):
         """
         Check if a Git tag exists for the package version based on tag format.
@@ -365,25 +590,16 @@ class PackageVersionManager:
             ValueError: If tag format cannot be generated from pyproject.toml.
         """
         try:
-            pyproject_data = package_info["pyproject_data"]
+            tag_name = self._resolve_tag_name(package_info, new_version)
 
-            # Retrieve project name
-            project_name = pyproject_data.get("project", {}).get("name")
-            if not project_name:
-                raise ValueError(
-                    f"Project name not found in {package_info['pyproject_path']}. Please specify it in the pyproject.toml."
-                )
-
-            tag_format = self._get_tag_format(package_info)
-
-            tag_name = tag_format.format(name=project_name, version=new_version)
-
-            cmd = ["git", "tag", "--list", tag_name]
+            # A direct ref lookup is constant-time, unlike listing and
+            # scanning every tag in the repo
+            cmd = ["git", "rev-parse", "--verify", "--quiet", f"refs/tags/{tag_name}"]
             result = subprocess.run(
-                cmd, cwd=self.repo_root, capture_output=True, text=True, check=True
+                cmd, cwd=self.repo_root, capture_output=True, text=True
             )
 
-            return tag_name in result.stdout.splitlines()
+            return result.returncode == 0
         except subprocess.CalledProcessError as e:
             print(
                 f"Error: Failed to run git tag command to check tag for {package_info['package_path']}: {e}"
@@ -412,18 +628,7 @@ class PackageVersionManager:
             ValueError: If the tag format cannot be generated from pyproject.toml.
         """
         try:
-            pyproject_data = package_info["pyproject_data"]
-
-            # Retrieve project name
-            project_name = pyproject_data.get("project", {}).get("name")
-            if not project_name:
-                raise ValueError(
-                    f"Project name not found in {package_info['pyproject_path']}. Please specify it in the pyproject.toml."
-                )
-
-            tag_format = self._get_tag_format(package_info)
-
-            tag_name = tag_format.format(name=project_name, version=new_version)
+            tag_name = self._resolve_tag_name(package_info, new_version)
 
             cmd = ["git", "tag", tag_name]
             subprocess.run(cmd, cwd=self.repo_root, check=True)
@@ -455,9 +660,68 @@ class PackageVersionManager:
         """
         updated_versions = {}
 
+        if not self.packages:
+            return updated_versions
+
+        # Prime the shared history scan before fanning out, so the worker
+        # threads read the cached result instead of racing to build it.
+        try:
+            self._collect_changes()
+        except subprocess.CalledProcessError as e:
+            # A failed scan leaves every package untouched below, so this is
+            # the only place the error can be reported
+            print(
+                f"Error collecting commits for range {self.prev_commit}^..{self.current_commit}: {e}"
+            )
+
+        # Work should scale with the packages actually touched in the range:
+        # a package whose prefixes intersect no changed path cannot bump, so
+        # it is skipped before any per-package work happens.
+        changed_paths = set()
+        for change in self._range_changes or []:
+            changed_paths.update(change.paths)
+
+        touched_packages = [
+            package_path
+            for package_path in self.packages
+            if any(
+                self._path_in_prefix(path, prefix)
+                for path in changed_paths
+                for prefix in self._package_path_prefixes(package_path)
+            )
+        ]
+
+        for package_path in self.packages:
+            if package_path not in touched_packages:
+                print(f"No changes found for {package_path}. Skipping version bump.")
+
+        # Nothing in the range reached any package (including an empty or
+        # unreadable range), so skip the bump machinery entirely
+        if not touched_packages:
+            return updated_versions
+
+        bump_types = dict.fromkeys(self.packages)
+
+        # Determining bumps is independent per package, so fan it out;
+        # writing versions and creating tags stays sequential below.
+        with ThreadPoolExecutor(
+            max_workers=min(len(touched_packages), os.cpu_count() or 1)
+        ) as executor:
+            bump_types.update(
+                zip(
+                    touched_packages,
+                    executor.map(self.determine_package_bump, touched_packages),
+                )
+            )
+
+        # Tags queued for the batch below, paired with the package each one
+        # belongs to so a failed batch can be reflected in the result
+        pending_tags = []
+        pending_tag_packages = []
+
         for package_path, package_info in self.packages.items():
             try:
-                bump_type = self.determine_package_bump(package_path)
+                bump_type = bump_types[package_path]
 
                 if not bump_type:
                     continue
@@ -474,14 +738,31 @@ class PackageVersionManager:
                 # Use cached pyproject data
                 pyproject_data = package_info["pyproject_data"]
 
-                # Update the version
+                # Update the version in the cached document so later reads
+                # of this package info stay consistent with the file
                 pyproject_data["project"]["version"] = new_version
 
-                # Write the updated data back to the file
-                with open(package_info["pyproject_path"], "w") as f:
-                    f.write(tomlkit.dumps(pyproject_data))
+                # Only the version line changes, so patch it in place on the
+                # raw bytes; re-serializing the whole document is the
+                # fallback when the assignment isn't where we expect it
+                pyproject_path = package_info["pyproject_path"]
+                with open(pyproject_path, "rb") as f:
+                    raw = f.read()
+                patched, count = _PYPROJECT_VERSION_RE.subn(
+                    rb"\g<1>" + new_version.encode() + rb"\g<2>", raw, count=1
+                )
+                if count == 1:
+                    with open(pyproject_path, "wb") as f:
+                        f.write(patched)
+                else:
+                    with open(pyproject_path, "w") as f:
+                        f.write(tomlkit.dumps(pyproject_data))
 
-                self.create_tag(package_info, new_version)
+                # Queue the tag; all tags are created in one batch below
+                pending_tags.append(
+                    self._resolve_tag_name(package_info, new_version)
+                )
+                pending_tag_packages.append(package_path)
 
                 updated_versions[package_path] = {
                     "old_version": current_version,
@@ -496,6 +777,19 @@ class PackageVersionManager:
             except Exception as e:
                 print(f"Failed to update version for {package_path}: {e}")
 
+        try:
+            self._create_tags_batch(pending_tags)
+        except Exception as e:
+            print(f"Failed to create tags {pending_tags}: {e}")
+            # update-ref --stdin is transactional, so none of the queued
+            # tags exist; an untagged bump is not a completed release, so
+            # drop the affected packages from the result
+            for package_path in pending_tag_packages:
+                print(
+                    f"Failed to update version for {package_path}: tag was not created"
+                )
+                updated_versions.pop(package_path, None)
+
         return updated_versions
 
 